@@ -4,11 +4,11 @@ import numpy as np
 import pandas as pd
 import random
 from math import sin, cos, sqrt, atan2, radians
+from numba import njit, prange
 from ease_grid import EASE2_grid
 import matplotlib
 matplotlib.use('Agg') # Must be before importing matplotlib.pyplot or pylab!
 import matplotlib.pyplot as plt
-from matplotlib import cm
 
 # approximate radius of earth in km
 def distance(lat1,lat2,lon1,lon2):
@@ -29,6 +29,40 @@ def distance(lat1,lat2,lon1,lon2):
 
     return(distance) #km
 
+@njit(cache=True, fastmath=True)
+def _apply_dynamics(state, melt_layers, upper_end, primitive, avg, frac_factor, fu, fl):
+    """
+    JIT-compiled per-cell update for state_dynamics: plain scalar loops
+    over one (layer,) slice of the state array, compiled by numba so the
+    python bytecode dispatch disappears from the hottest loop.
+    """
+    # Set lower layer to primitive initial state.
+    for i in range(upper_end, melt_layers):
+        state[i] = primitive
+
+    # Impact melt portion  (Upper)
+    for i in range(upper_end):
+        state[i] = avg / (1 - frac_factor)
+
+    # Weighted average of upper
+    wt_sio2_upper = state[0]
+
+    # Lower of impact melt portion
+    val = (avg - fu * wt_sio2_upper) / fl
+    for i in range(upper_end, melt_layers):
+        state[i] = val
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _apply_all(state, ii, jj, melt_layers, upper_end, primitive, avg, frac_factor, fu, fl):
+    """
+    Apply the per-cell dynamics to every hit cell of one impact in
+    parallel. Each cell owns a disjoint (layer,) slice of the state, so
+    the prange loop is race-free.
+    """
+    for k in prange(ii.shape[0]):
+        _apply_dynamics(state[ii[k], jj[k]], melt_layers, upper_end,
+                        primitive, avg, frac_factor, fu, fl)
+
 class IMPAaCS:
 
     """
@@ -42,9 +76,11 @@ class IMPAaCS:
     during the Hadean to determine how rapidly it evolved.
     """
     
-    impact_test_id = str(round(0.14122179,4))+' '+str(round(0.18672199,4))
-    
-    def __init__(self, egrid, 
+    # Coordinates of the single grid cell we track through the simulation
+    impact_test_lon = 0.14122179
+    impact_test_lat = 0.18672199
+
+    def __init__(self, egrid,
                  verbose=False,
                  max_depth_of_impact_melt=330,
                  ensemble = 0,
@@ -78,12 +114,20 @@ class IMPAaCS:
         self.sim_time=sim_time
         
         self.count_test_hits = 0
-        self.grid_cell_state = {}
         self.impacted_grid_cells = []
         self.impactors_at_test_cell = [0]
         self.test_time = [0]
                 
         self.sample_percents = {}
+        self._surface_cache = None
+
+        # Persistent figure for plot_map_and_bar, created on first use
+        # and redrawn in place instead of rebuilt every frame.
+        self._fig = None
+        self._ax_map = None
+        self._ax_bar = None
+        self._cbar = None
+        self._cmap = None
         self.lon_lims=lon_lims
         self.lat_lims=lat_lims
         self.lon_subset=[]
@@ -93,6 +137,30 @@ class IMPAaCS:
         self.get_subset_of_grids()
         self.n_x = len(self.lon_subset)
         self.n_y = len(self.lat_subset)
+
+        # Cache the subset coordinates in radians so every impact search
+        # runs as one broadcast haversine instead of a python double loop.
+        # float32 is ample for SiO2 percentages and km-scale distances,
+        # and halves the memory traffic of every hot path.
+        self._lon_rad = np.radians(np.asarray(self.lon_subset, dtype=np.float32))
+        self._lat_rad = np.radians(np.asarray(self.lat_subset, dtype=np.float32))
+        self._cos_lat = np.cos(self._lat_rad)
+
+        # lat_subset runs north to south; its negation is ascending with
+        # the same index order, which is what searchsorted needs.
+        self._neg_lat_subset = -self.lat_subset
+
+        # Locate the test cell once as integer indices, so the hot loop
+        # compares ints instead of formatting a string key per cell.
+        self._i_test = self.lon_index(self.impact_test_lon)
+        self._j_test = self.lat_index(self.impact_test_lat)
+
+        # Constants of the dynamics, hoisted out of the per-cell update:
+        # melt_layers is bounded, so the upper-layer split is a small LUT.
+        self._max_melt_layers = int(self.max_depth_of_impact_melt / self.z_discretized_km)
+        self._upper_end_lut = np.array([int(round(self.fraction_upper_layer * m, 2))
+                                        for m in range(self._max_melt_layers + 1)])
+        self._fractionation_factor = 1 - (self.target_SiO2 / self.upper_SiO2)
         
         # Finally we set up the state data
         self.state_prep()
@@ -105,137 +173,204 @@ class IMPAaCS:
         if len(self.impacted_grid_cells) > 0:
             self.get_average_target(impactor_diameter)
             self.loop_impact_grid(impactor_diameter)
+            self._surface_cache = None # state changed, surface is stale
+
+    #--------------------------------------------------------------------------------------------------
+    def update_batch(self, impact_locs, impactor_diameters, sim_times=0):
+        """
+        Apply a batch of impacts in one call. The grid search for all K
+        impacts runs as a single (K, lon, lat) broadcast haversine; the
+        dynamics are still applied impact by impact, in order, so the
+        result matches K sequential update() calls.
+        """
+        locs = np.asarray(impact_locs, dtype=float).reshape(-1, 2)
+        diameters = np.asarray(impactor_diameters).reshape(-1)
+        sim_times = np.broadcast_to(np.asarray(sim_times), (locs.shape[0],))
+        if locs.shape[0] < 1:
+            return
+
+        lat1 = np.radians(locs[:, 0])[:, None, None]
+        lon1 = np.radians(locs[:, 1])[:, None, None]
+        dlon = self._lon_rad[None, :, None] - lon1
+        dlat = self._lat_rad[None, None, :] - lat1
+        a = np.sin(dlat / 2)**2 + np.cos(lat1) * self._cos_lat[None, None, :] * np.sin(dlon / 2)**2
+
+        for k in range(locs.shape[0]):
+            self.sim_time = sim_times[k]
+            self.impact_dimensions(diameters[k])
+            self.select_the_hits(a[k], locs[k])
+            if len(self.impacted_grid_cells) > 0:
+                self.get_average_target(diameters[k])
+                self.loop_impact_grid(diameters[k])
+                self._surface_cache = None # state changed, surface is stale
         
     #--------------------------------------------------------------------------------------------------
     #---- THIS IS THE MAIN CODE -------------------- THIS IS THE MAIN CODE ----------------------------
     #--------------------------------------------------------------------------------------------------
-    def state_dynamics(self, impactor_diameter, grid_cell_id):
+    def state_dynamics(self, impactor_diameter):
         """
         This is the critical component of this model
-        This function will change the chemical makeup of each grid cell
+        This function will change the chemical makeup of each impacted grid cell
             according to the chemical theory put forward by Faltys-Wielicki [2021]
         """
-        
+
         #####      DYNAMIC FACTORS       ############################
         depth_of_impact_melt = impactor_diameter * self.proportion_melt_from_impact # D/3
 
         #Vertical discretization.
         melt_layers = int(depth_of_impact_melt / self.z_discretized_km)
 
-        lower_layer  = range(int(round(self.fraction_upper_layer * melt_layers,2)), melt_layers)
-        upper_layer  = range(0, int(round(self.fraction_upper_layer * melt_layers,2)))
+        upper_end = int(self._upper_end_lut[melt_layers])
 
         fracionated_melt = depth_of_impact_melt * self.fraction_upper_layer #Units: km
 
-        fractionation_factor = 1 - (self.target_SiO2 / self.upper_SiO2)
-
         #####      DO THE DYANMICS       #############################
-        # Set lower layer to primitive initial state.  
-        for i in lower_layer:
-            self.grid_cell_state[grid_cell_id][i] = self.primitive_initial_state
-
-        # Impact melt portion  (Upper)
-        for i in upper_layer:
-            self.grid_cell_state[grid_cell_id][i] = self.average_target / (1 - fractionation_factor)
-
-        # Weighted average of upper    
-        wt_sio2_upper = self.grid_cell_state[grid_cell_id][0]
-
-        # Lower of impact melt portion
-        for i in lower_layer:
-            numerator = self.average_target-(self.fraction_upper_layer * wt_sio2_upper)
-            self.grid_cell_state[grid_cell_id][i] = numerator / self.fraction_lower_layer
-
-        for i in range(melt_layers):
-            self.grid_cell_state[grid_cell_id][i] = np.round(self.grid_cell_state[grid_cell_id][i],1)
+        # The factors are shared by every cell of this impact, so all
+        # hit cells are updated by one parallel kernel call.
+        _apply_all(self.state, self._hit_i, self._hit_j, melt_layers, upper_end,
+                   self.primitive_initial_state, self.average_target,
+                   self._fractionation_factor,
+                   self.fraction_upper_layer, self.fraction_lower_layer)
     
     #--------------------------------------------------------------------------------------------------    
     def state_prep(self):
-        total_layers = int(self.max_depth_of_impact_melt / self.z_discretized_km)
-        for ilon in self.lon_subset:
-            for ilat in self.lat_subset:
-                grid_cell_id = str(round(ilon,4))+' '+str(round(ilat,4))
-                self.grid_cell_state[grid_cell_id] = np.ones(total_layers) * self.primitive_initial_state
+        # One contiguous (lon, lat, layer) array instead of a dict of
+        # per-cell vectors keyed by formatted coordinate strings.
+        self.state = np.full((self.n_x, self.n_y, self._max_melt_layers),
+                             self.primitive_initial_state, dtype=np.float32)
         
     #--------------------------------------------------------------------------------------------------    
     def get_average_target(self, impactor_diameter):
-        average_target = 0
-        for grid_cell in self.impacted_grid_cells:
-            grid_cell_id = str(round(grid_cell[0],4))+' '+str(round(grid_cell[1],4))
-            ### If the grid cell has not been hit yet, it is the initial primitive value
-            if grid_cell_id in self.grid_cell_state.keys():
-                average_target += np.sum(self.grid_cell_state[grid_cell_id][:self.z_layers])
-            else:
-                average_target += self.primitive_initial_state * self.z_layers
-        self.average_target = average_target/(len(self.impacted_grid_cells) * self.z_layers)
+        # The state array is preallocated, so every hit cell exists and
+        # the whole average is a single fancy-indexed reduction.
+        block = self.state[self._hit_i, self._hit_j, :self.z_layers]
+        self.average_target = float(block.mean())
         
     #--------------------------------------------------------------------------------------------------    
     def find_the_grid(self, impact_loc):
-        self.impacted_grid_cells = [] # first reset the impacted grid cells, then fill them up
-        Dmin=10000000
-        for ilon in self.lon_subset:
-            for ilat in self.lat_subset:
-                D = distance(impact_loc[0],ilat,impact_loc[1],ilon)
-                if D < Dmin:
-                    Dmin = D
-                if D <= self.crator_radius:
-                    self.impacted_grid_cells.append([ilon, ilat])
+
+        # Broadcast haversine against the whole subset at once:
+        # rows are longitude, columns are latitude, so a[i, j] measures
+        # the distance from the impact to (lon_subset[i], lat_subset[j]).
+        # Only the intermediate 'a' is needed on this path (see
+        # impact_dimensions); the full arc is computed on the fallback.
+        lat1 = radians(impact_loc[0])
+        lon1 = radians(impact_loc[1])
+        dlon = self._lon_rad[:, None] - lon1
+        dlat = self._lat_rad[None, :] - lat1
+        a = np.sin(dlat / 2)**2 + cos(lat1) * self._cos_lat[None, :] * np.sin(dlon / 2)**2
+
+        self.select_the_hits(a, impact_loc)
+
+    #--------------------------------------------------------------------------------------------------
+    def select_the_hits(self, a, impact_loc):
+        # Hold the hit cells once, as integer (i, j) indices into the
+        # state array, shared by every consumer of this impact.
+        self.impacted_grid_cells = np.argwhere(a <= self._a_threshold)
+        self._hit_i = self.impacted_grid_cells[:, 0]
+        self._hit_j = self.impacted_grid_cells[:, 1]
         if len(self.impacted_grid_cells) < 1:
-            
-            # If the crator didn't impact any grids in the subsample, 
+
+            # If the crator didn't impact any grids in the subsample,
             # Check to see if the min distance is smaller than the length of a grid.
             # If it is, we can assign it to the closest grid.
             # If not, then just ignore it.
-            if Dmin < 30:
+            a_min = a.min()
+            if a_min <= sin(15 / 6373.0)**2: # i.e. Dmin < 30 km
                 if self.verbose:
+                    Dmin = 2 * 6373.0 * atan2(sqrt(a_min), sqrt(1 - a_min))
                     print("Warning. There are no grids impacted!")
                     print('Dmin', Dmin, 'crator radius', self.crator_radius, 'impact location', impact_loc)
-                for ilon in self.lon_subset:
-                    for ilat in self.lat_subset:
-                        D = distance(impact_loc[0],ilat,impact_loc[1],ilon)
-                        if D == Dmin:
-                            self.impacted_grid_cells.append([ilon, ilat])
-                            if self.verbose:
-                                print('impacting grid cell', [ilon, ilat])
+                i, j = np.unravel_index(a.argmin(), a.shape)
+                self.impacted_grid_cells = np.array([[i, j]])
+                self._hit_i = self.impacted_grid_cells[:, 0]
+                self._hit_j = self.impacted_grid_cells[:, 1]
+                if self.verbose:
+                    print('impacting grid cell', [self.lon_subset[i], self.lat_subset[j]])
 
     #--------------------------------------------------------------------------------------------------    
     def loop_impact_grid(self, impactor_diameter):
-        for grid_cell in self.impacted_grid_cells:
-            grid_cell_id = str(round(grid_cell[0],4))+' '+str(round(grid_cell[1],4))
 
-            ################      DO THE DYANMICS       #############################
-            self.state_dynamics(impactor_diameter, grid_cell_id)
+        ################      DO THE DYANMICS       #############################
+        self.state_dynamics(impactor_diameter)
 
-            self.test_one_grid_cell(grid_cell_id, impactor_diameter)
-    #--------------------------------------------------------------------------------------------------    
+        # The test cell appears at most once per impact; checking it here
+        # keeps all bookkeeping out of the parallel kernel.
+        if np.any((self._hit_i == self._i_test) & (self._hit_j == self._j_test)):
+            self.test_one_grid_cell(self._i_test, self._j_test, impactor_diameter)
+    #--------------------------------------------------------------------------------------------------
+    @staticmethod
+    def _nearest_index(arr, value):
+        # Binary search into a sorted-ascending coordinate axis, then
+        # pick the nearer of the two neighbouring cells.
+        k = int(np.searchsorted(arr, value))
+        if k <= 0:
+            return 0
+        if k >= arr.shape[0]:
+            return arr.shape[0] - 1
+        return k if (arr[k] - value) < (value - arr[k - 1]) else k - 1
+
+    #--------------------------------------------------------------------------------------------------
+    def lon_index(self, lon):
+        # lon_subset is sorted ascending
+        return self._nearest_index(self.lon_subset, lon)
+
+    #--------------------------------------------------------------------------------------------------
+    def lat_index(self, lat):
+        # lat_subset runs north to south, so search its negated view
+        return self._nearest_index(self._neg_lat_subset, -lat)
+
+    #--------------------------------------------------------------------------------------------------
     def impact_dimensions(self, impactor_diameter):
             # The impact crator is 10*Diameter, so the radius is half that
             self.crator_diameter = 10*impactor_diameter
             self.crator_radius = self.crator_diameter/2
             self.z_layers = int(np.ceil(impactor_diameter / self.z_discretized_km))
+            # Haversine distance is monotonic in the intermediate 'a', so
+            # the radius test can compare 'a' directly and skip sqrt/arctan2.
+            self._a_threshold = sin(self.crator_radius / (2 * 6373.0))**2
 
     #--------------------------------------------------------------------------------------------------    
-    def test_one_grid_cell(self, grid_cell_id, impactor_diameter):
+    def test_one_grid_cell(self, i, j, impactor_diameter):
         ##### Testing one cell:
-        if grid_cell_id == self.impact_test_id:
+        if i == self._i_test and j == self._j_test:
             self.count_test_hits+=1
             self.test_time.append(self.sim_time)
             self.impactors_at_test_cell.append(impactor_diameter)
             self.average_test_target_list.append(self.average_target)
-            self.top_layer_at_test_cell.append(self.grid_cell_state[self.impact_test_id][0])
+            self.top_layer_at_test_cell.append(np.round(self.state[i, j, 0], 1))
 
     #--------------------------------------------------------------------------------------------------
-    def re_bin_sio2(self, temp_state, s_min=1, s_max=100, ds=1):
+    def re_bin_sio2(self, temp_state, s_min=1, s_max=100, out=None):
         """
             Functionto place the mean SiO2 into the proper bin for distribution.
+            The bins are the integers s_min..s_max, so this is just a
+            clipped ceiling. Works on scalars and on whole arrays; pass a
+            float array as out to run the ceiling and clip in place.
         """
-        for s in range(s_min,s_max,ds):
-            if temp_state<=s:
-                return s
-            elif temp_state>=s_max:
-                return s_max
-            else:
-                continue
+        binned = np.ceil(temp_state, out=out)
+        if out is None:
+            return np.clip(binned, s_min, s_max).astype(np.int32)
+        np.clip(out, s_min, s_max, out=out)
+        return out.astype(np.int32)
+
+    # ---------------------------------------------------------------------------------------------
+    def _compute_surface(self):
+
+        """
+            Binned mean SiO2 of the top two layers, shared by
+            plot_map_and_bar and do_sample_percents. Cached until the
+            next impact changes the state.
+        """
+
+        if self._surface_cache is None:
+            # The state is kept at full precision; the one-decimal
+            # rounding happens here, once, at read time. After the mean
+            # every step runs in place, so the only float temporary is z.
+            z = self.state[:, :, 0:2].mean(axis=2)
+            np.round(z, 1, out=z)
+            self._surface_cache = self.re_bin_sio2(z, out=z)
+        return self._surface_cache
 
     # ---------------------------------------------------------------------------------------------
     def plot_map_and_bar(self, save_figure=False, plot_figure=False, fig_path='./'):
@@ -252,49 +387,49 @@ class IMPAaCS:
             print('not plotting figure')
             return
 
-        z = np.zeros([self.n_x, self.n_y])
-        bar_list = []
-        for i, ilon in enumerate(self.lon_subset):
-            for j, ilat in enumerate(self.lat_subset):
-                grid_cell = str(round(ilon,4))+' '+str(round(ilat,4))
-                temp_state = np.mean(self.grid_cell_state[grid_cell][0:2])
-                temp_state = self.re_bin_sio2(temp_state)
-                z[i, j] = temp_state
-        
-        X, Y = np.meshgrid(self.lon_subset, self.lat_subset)
-        
-        fig = plt.figure(figsize=(12, 7))
-
-        grid = plt.GridSpec(1, 7, wspace = .1, hspace = .1)
-        plt.subplots_adjust(wspace= 0.1, hspace= 0.1)
+        z = self._compute_surface()
 
-        plt.subplot(grid[0, :5])
-        
         levels = np.arange(34, 70, 2)
-        cmap = cm.jet
-        cs = plt.contourf(X, Y, np.transpose(z), levels, cmap=cm.get_cmap(cmap, len(levels) - 1)) 
-        cbar = fig.colorbar(cs, ticks=range(34,70,2))
-
-        plt.title('Surface SiO2 content at {}myr'.format(int(self.sim_time/1000000)))
-        plt.xlabel('longitude')
-        plt.ylabel('latitude')
-        plt.xlim(self.lon_lims)
-        plt.ylim(self.lat_lims)
-        plt.xticks(np.arange(self.lon_lims[0], self.lat_lims[1], 10))
-        
-        plt.subplot(grid[0, 5:])
-        plt.bar(list(self.sample_percents.keys()), list(self.sample_percents.values()), width=1.2)
-        plt.xlim([35,70])
-        plt.ylim([0,40])
-        plt.xlabel('Surface SiO2 content')
-        plt.ylabel('Percent surface area')
-        plt.xticks(np.arange(35, 75, 5))
+
+        # Build the figure, axes, and colormap once; later frames only
+        # clear the axes and redraw the data.
+        if self._fig is None:
+            self._fig, (self._ax_map, self._ax_bar) = plt.subplots(
+                    1, 2, figsize=(12, 7),
+                    gridspec_kw={'width_ratios': [5, 2], 'wspace': .1, 'hspace': .1})
+            self._cmap = plt.get_cmap('jet', len(levels) - 1)
+        else:
+            self._ax_map.clear()
+            self._ax_bar.clear()
+
+        # The subset is a regular lat/lon raster, so a direct image blit
+        # replaces the contour triangulation. Rows of z.T run north to
+        # south, matching origin='upper'.
+        im = self._ax_map.imshow(np.transpose(z), origin='upper',
+                extent=[self.lon_lims[0], self.lon_lims[1], self.lat_lims[0], self.lat_lims[1]],
+                cmap=self._cmap, vmin=levels[0], vmax=levels[-1],
+                interpolation='nearest', aspect='auto')
+        if self._cbar is None:
+            self._cbar = self._fig.colorbar(im, ax=self._ax_map, ticks=range(34,70,2))
+
+        self._ax_map.set_title('Surface SiO2 content at {}myr'.format(int(self.sim_time/1000000)))
+        self._ax_map.set_xlabel('longitude')
+        self._ax_map.set_ylabel('latitude')
+        self._ax_map.set_xlim(self.lon_lims)
+        self._ax_map.set_ylim(self.lat_lims)
+        self._ax_map.set_xticks(np.arange(self.lon_lims[0], self.lat_lims[1], 10))
+
+        self._ax_bar.bar(list(self.sample_percents.keys()), list(self.sample_percents.values()), width=1.2)
+        self._ax_bar.set_xlim([35,70])
+        self._ax_bar.set_ylim([0,40])
+        self._ax_bar.set_xlabel('Surface SiO2 content')
+        self._ax_bar.set_ylabel('Percent surface area')
+        self._ax_bar.set_xticks(np.arange(35, 75, 5))
         if save_figure:
-            plt.savefig(fig_path+'{}myr.png'.format(int(self.sim_time/1000000)), 
+            self._fig.savefig(fig_path+'{}myr.png'.format(int(self.sim_time/1000000)),
                     bbox_inches='tight', dpi = 100)
         if plot_figure:
             plt.show()
-        plt.close()
         
     # ---------------------------------------------------------------------------------------------
     def do_sample_percents(self, n_layers=2):
@@ -307,36 +442,19 @@ class IMPAaCS:
                 n_layers = number of discretized layers to include in the average.
         """
         
-        z = np.zeros([self.n_x, self.n_y])
-        bar_list = []
-        for i, ilon in enumerate(self.lon_subset):
-            for j, ilat in enumerate(self.lat_subset):
-                grid_cell = str(round(ilon,4))+' '+str(round(ilat,4))
-                temp_state = np.mean(self.grid_cell_state[grid_cell][0:2])
-                temp_state = self.re_bin_sio2(temp_state)
-                z[i, j] = temp_state
-                
-                mean_sio2 = np.mean(self.grid_cell_state[grid_cell][0:2])
-                if not np.isnan(mean_sio2):
-                    bar_list.append(self.re_bin_sio2(mean_sio2))
-        
-        bar_list = [x for x in bar_list if x != None]
-        
-        bar_data = {}
-        for u in np.unique(bar_list):
-            bar_data[u] = 100*bar_list.count(u)/len(bar_list)
+        flat = self._compute_surface().ravel()
+        vals, counts = np.unique(flat, return_counts=True)
+        total = counts.sum()
 
-        self.sample_percents = bar_data
+        self.sample_percents = {int(v): 100.0*c/total for v, c in zip(vals, counts)}
         
     # ---------------------------------------------------------------------------------------------
     def get_subset_of_grids(self):
-        for ilon in self.egrid.londim:
-            for ilat in self.egrid.latdim:
-                if ilat > self.lat_lims[0] and ilat < self.lat_lims[1]:
-                    if ilon > self.lon_lims[0] and ilon < self.lon_lims[1]:
-                        if ilat not in self.lat_subset:
-                            self.lat_subset.append(ilat)
-                        if ilon not in self.lon_subset:
-                            self.lon_subset.append(ilon)
+        # The two axes filter independently, so two boolean masks replace
+        # the full londim x latdim cartesian product with membership tests.
+        lon_mask = (self.egrid.londim > self.lon_lims[0]) & (self.egrid.londim < self.lon_lims[1])
+        lat_mask = (self.egrid.latdim > self.lat_lims[0]) & (self.egrid.latdim < self.lat_lims[1])
+        self.lon_subset = self.egrid.londim[lon_mask]
+        self.lat_subset = self.egrid.latdim[lat_mask]
 
 
@@ -104,9 +104,11 @@ for ensemble_member in range(200,300):
                    lon_lims = [-impact_boundz, impact_boundz], lat_lims = [-impact_boundz, impact_boundz])
     for it, t in enumerate(df.index.values):
         start_time = time.time()
+        impact_locs = []
+        impactor_diameters = []
         for d in diam_labs:
             for i in range(int(df.loc[t,d])):
-    
+
                 # locate the the impacts on earth
                 impact_lat = random.randrange(-90,90)
                 impact_lon = random.randrange(-180,180)
@@ -114,12 +116,14 @@ for ensemble_member in range(200,300):
                     continue
                 if np.abs(impact_lon) > impact_boundz:
                     continue
-                impact_loc = [impact_lat, impact_lon]
-                impactor_diameter = random.randrange(diam_range[d][0],diam_range[d][1])
-                    
-                #####      DO THE DYANMICS       #############################
-                Impc.update(impact_loc, impactor_diameter, t)
-                
+                impact_locs.append([impact_lat, impact_lon])
+                impactor_diameters.append(random.randrange(diam_range[d][0],diam_range[d][1]))
+
+        #####      DO THE DYANMICS       #############################
+        # One batched call per time step: the grid search for every
+        # impact this step is a single broadcast haversine.
+        Impc.update_batch(impact_locs, impactor_diameters, t)
+
         Impc.do_sample_percents(n_layers=2)
         
         if it == 0:
@@ -136,6 +140,6 @@ for ensemble_member in range(200,300):
 #            print(Impc.average_test_target_list)
 #            print(Impc.top_layer_at_test_cell)
 #            with open('impact_states/ensembles_3June2021/{}/{}.pkl'.format(ensemble_member, it), 'wb') as f:
-#                pkl.dump(Impc.grid_cell_state, f, pkl.HIGHEST_PROTOCOL)
+#                pkl.dump(Impc.state, f, pkl.HIGHEST_PROTOCOL)
     
     percent_df.to_csv("sio2_percent_tables/3june2021/ensemble_{}.csv".format(ensemble_member))
@@ -111,7 +111,7 @@ for it, t in enumerate(df.index.values):
 #    I.plot_map()
 
     with open('impact_states/impacts_10min_45lat_t{}.pkl'.format(it), 'wb') as f:
-        pkl.dump(I.grid_cell_state, f, pkl.HIGHEST_PROTOCOL)
+        pkl.dump(I.state, f, pkl.HIGHEST_PROTOCOL)
 
 print(I.test_time)
 print(I.average_test_target_list)